@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Color Feature Index for Passport Covers
+
+Computes a color histogram, dominant color and mean hue for each passport cover
+and caches them on disk, keyed by a hash of the image file contents. The sort key
+functions below can be passed straight to sorted() to order covers for get_poster.
+"""
+
+from PIL import Image
+import colorsys
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Dict, List
+
+# Configuration for feature extraction
+FEATURE_IMAGE_SIZE = (64, 90)  # Reduced resolution the covers are decoded at (keeps the cover aspect ratio)
+HISTOGRAM_BINS_PER_CHANNEL = 4  # 4×4×4 = 64 bin joint RGB histogram
+MIN_ALPHA = 128  # Pixels more transparent than this are ignored
+MIN_SATURATION = 0.15  # Colors below this saturation are treated as gray when sorting
+FEATURE_VERSION = 1  # Bump when compute_color_features changes so cached features are recomputed
+
+# Paths
+COLOR_INDEX_PATH = './color_index.json'
+
+
+def get_file_content_hash(image_path: str) -> str:
+    """Return the SHA-256 hex digest of an image file's contents."""
+    sha256 = hashlib.sha256()
+    with open(image_path, 'rb') as image_file:
+        for chunk in iter(lambda: image_file.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_feature_parameters() -> dict:
+    """Return the settings the cached features depend on; a cache built with other settings is discarded."""
+    return {
+        "version": FEATURE_VERSION,
+        "image_size": list(FEATURE_IMAGE_SIZE),
+        "histogram_bins": HISTOGRAM_BINS_PER_CHANNEL,
+        "min_alpha": MIN_ALPHA,
+        "min_saturation": MIN_SATURATION,
+    }
+
+
+def compute_color_features(image_path: str) -> dict:
+    """
+    Compute the color features of a passport cover from a reduced-resolution decode.
+
+    Args:
+        image_path: File path of the passport image
+
+    Returns:
+        Dictionary with "histogram" (normalized joint RGB histogram), "dominant_color"
+        (RGB list of the most common histogram bin) and "mean_hue" (saturation-weighted
+        circular mean hue in degrees, or None for covers without noticeable color)
+    """
+    pp_image = Image.open(image_path)
+    # JPEG covers decode straight at a reduced scale; other formats ignore this
+    pp_image.draft("RGB", FEATURE_IMAGE_SIZE)
+    small_image = pp_image.convert("RGBA").resize(FEATURE_IMAGE_SIZE, Image.Resampling.BOX)
+
+    pixels = np.asarray(small_image).reshape(-1, 4)
+    opaque_pixels = pixels[pixels[:, 3] >= MIN_ALPHA]
+    if len(opaque_pixels) == 0:
+        opaque_pixels = pixels
+    rgb = opaque_pixels[:, :3].astype(np.int64)
+
+    # Joint RGB histogram
+    bins = HISTOGRAM_BINS_PER_CHANNEL
+    channel_bins = rgb * bins // 256
+    bin_indices = (channel_bins[:, 0] * bins + channel_bins[:, 1]) * bins + channel_bins[:, 2]
+    bin_counts = np.bincount(bin_indices, minlength=bins ** 3)
+    histogram = bin_counts / len(rgb)
+
+    # Dominant color: mean color of the pixels in the most populated bin
+    dominant_bin = int(np.argmax(bin_counts))
+    dominant_color = rgb[bin_indices == dominant_bin].mean(axis=0)
+
+    # Mean hue, weighted by how saturated and bright each pixel is
+    hsv = np.asarray(Image.fromarray(rgb.astype(np.uint8).reshape(1, -1, 3), "RGB").convert("HSV"))
+    hsv = hsv.reshape(-1, 3).astype(np.float64) / 255.0
+    angles = hsv[:, 0] * 2 * np.pi
+    weights = hsv[:, 1] * hsv[:, 2]
+    mean_hue = None
+    if weights.sum() / len(weights) >= MIN_SATURATION ** 2:
+        mean_angle = np.arctan2((weights * np.sin(angles)).sum(), (weights * np.cos(angles)).sum())
+        mean_hue = float(np.degrees(mean_angle) % 360)
+
+    return {
+        "histogram": [round(float(value), 5) for value in histogram],
+        "dominant_color": [int(round(value)) for value in dominant_color],
+        "mean_hue": mean_hue,
+    }
+
+
+def load_color_index(image_paths: List[str], index_path: str = COLOR_INDEX_PATH) -> Dict[str, dict]:
+    """
+    Get the color features for every image, computing only those missing from the cache.
+
+    Cache entries are keyed by the content hash of the image file, so an edited or
+    replaced cover is recomputed while renamed or moved covers are not. The whole cache
+    is rebuilt when the feature settings (get_feature_parameters) have changed.
+
+    Args:
+        image_paths: List of file paths to passport images
+        index_path: Path of the JSON cache file (default: "./color_index.json")
+
+    Returns:
+        Dictionary mapping each image path to its color features
+    """
+    feature_parameters = get_feature_parameters()
+    cached_features = {}
+    if os.path.exists(index_path):
+        with open(index_path) as index_file:
+            cached_index = json.load(index_file)
+        if cached_index.get("feature_parameters") == feature_parameters:
+            cached_features = cached_index["features"]
+        else:
+            print(f"Color feature settings changed, rebuilding '{index_path}'")
+
+    color_index = {}
+    num_computed = 0
+    for image_path in image_paths:
+        content_hash = get_file_content_hash(image_path)
+        if content_hash not in cached_features:
+            cached_features[content_hash] = compute_color_features(image_path)
+            num_computed += 1
+        color_index[image_path] = cached_features[content_hash]
+
+    if num_computed:
+        print(f"Computed color features for {num_computed} passport covers")
+        index_dir = os.path.dirname(index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        with open(index_path, 'w') as index_file:
+            json.dump({"feature_parameters": feature_parameters, "features": cached_features}, index_file)
+
+    return color_index
+
+
+def hue_sort_key(color_index: Dict[str, dict]):
+    """
+    Sort key ordering covers along the hue wheel (red, orange, ... violet), grays last.
+
+    Example:
+        sorted(paths, key=hue_sort_key(load_color_index(paths)))
+    """
+    def key(image_path: str):
+        mean_hue = color_index[image_path]["mean_hue"]
+        if mean_hue is None:
+            return (1, 0.0, image_path.split("/")[-1])
+        return (0, mean_hue, image_path.split("/")[-1])
+    return key
+
+
+def dominant_color_sort_key(color_index: Dict[str, dict]):
+    """
+    Sort key grouping covers by the hue of their dominant color, then dark to light.
+
+    Covers whose dominant color is gray, black or white come last, ordered dark to light.
+    """
+    def key(image_path: str):
+        r, g, b = (channel / 255.0 for channel in color_index[image_path]["dominant_color"])
+        hue, saturation, value = colorsys.rgb_to_hsv(r, g, b)
+        if saturation < MIN_SATURATION:
+            return (1, 0.0, value, image_path.split("/")[-1])
+        return (0, hue, value, image_path.split("/")[-1])
+    return key
+
+
+def histogram_distance(color_index: Dict[str, dict], path_a: str, path_b: str) -> float:
+    """Return the L1 distance between the color histograms of two covers (0 to 2)."""
+    histogram_a = np.asarray(color_index[path_a]["histogram"])
+    histogram_b = np.asarray(color_index[path_b]["histogram"])
+    return float(np.abs(histogram_a - histogram_b).sum())
@@ -7,7 +7,11 @@ Each passport can optionally include the country name below it.
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import inspect
+import io
 import os
+import numpy as np
 from typing import List, Tuple
 
 # Configuration for text labels
@@ -44,6 +48,22 @@ FOOTER_BACKGROUND_COLOR = (255, 255, 255, 255)  # White background
 FOOTER_TEXT_COLOR = (0, 0, 0, 255)  # Black text
 FOOTER_LEFT_MARGIN = 40  # Left margin for footer text in pixels
 
+# Configuration for PDF output
+DEFAULT_PDF_DPI = 300  # Print resolution the poster pixels are mapped to
+PDF_COVER_JPEG_QUALITY = 95  # JPEG quality of embedded opaque passport covers
+PDF_FALLBACK_FONT = "Helvetica"  # Standard PDF font used when a font cannot be embedded
+PDF_FALLBACK_BOLD_FONT = "Helvetica-Bold"
+
+# Configuration for size-targeted export
+DEFAULT_EXPORT_QUALITY = 95  # Highest quality tried (and the quality used by main())
+MIN_EXPORT_QUALITY = 10  # Lowest quality tried when searching for a target size or SSIM
+SAMPLE_TILE_SIZE = 512  # Side of the square tiles used to estimate file size and SSIM
+SAMPLE_TILE_GRID = (4, 3)  # Columns × rows of sample tiles spread over the poster
+SIZE_ESTIMATE_MARGIN = 0.9  # Aim the size estimate at this fraction of max_bytes to absorb sampling error
+
+# Configuration for interactive previews
+DEFAULT_PREVIEW_SCALE = 0.15  # Preview pixels per poster pixel (~2000 px wide for the world poster)
+
 # Paths
 ROOT_OF_IMAGES = './ppcovers/'
 REGION_FOLDERS = ["africa", "oceania", "asia", "south_america", "north_america", "europe"]
@@ -78,36 +98,20 @@ def get_country_name_from_path(path: str) -> str:
     return country_name
 
 
-def add_text_label_to_image(
-    image: Image.Image,
-    text: str,
-    font_size: int = DEFAULT_FONT_SIZE,
-    font_family: str = DEFAULT_FONT_FAMILY,
-    text_color: Tuple[int, int, int, int] = TEXT_COLOR,
-    bg_color: Tuple[int, int, int, int] = TEXT_BACKGROUND_COLOR
-) -> Image.Image:
-    """
-    Add a text label below the passport image.
-
-    Args:
-        image: PIL Image object (the passport cover)
-        text: String to display (country name)
-        font_size: Size of the font in pixels
-        font_family: Font family name (must be installed on system)
-        text_color: RGBA tuple for text color
-        bg_color: RGBA tuple for background color
-
-    Returns:
-        New PIL Image with text label below the passport image
-    """
-    # Reduce font size for long country names (> 22 characters)
+def get_label_font_size(text: str, font_size: int) -> int:
+    """Reduce the label font size for long country names (>= 22 characters)."""
     adjusted_font_size = font_size
     if len(text) >= 30:
         adjusted_font_size = int(font_size * 0.65)
     elif len(text) >= 24:
         adjusted_font_size = int(font_size * 0.9)  # Reduce to 75% of original size
     elif len(text) >= 22:
-        adjusted_font_size = int(font_size * 0.9)  # Reduce to 75% of original size        
+        adjusted_font_size = int(font_size * 0.9)  # Reduce to 75% of original size
+    return adjusted_font_size
+
+
+def load_label_font(font_family: str, font_size: int) -> ImageFont.ImageFont:
+    """Load the bold variant of a label font, falling back to Arial and then PIL's default font."""
     # Try to load the BOLD version of the specified font
     font = None
     bold_font_variations = [
@@ -123,7 +127,7 @@ def add_text_label_to_image(
 
     for font_variant in bold_font_variations:
         try:
-            font = ImageFont.truetype(font_variant, adjusted_font_size)
+            font = ImageFont.truetype(font_variant, font_size)
             break  # Success! Stop trying
         except:
             continue
@@ -133,6 +137,33 @@ def add_text_label_to_image(
         font = ImageFont.load_default()
         print(f"Warning: Could not load bold font for '{font_family}', using default font")
 
+    return font
+
+
+def add_text_label_to_image(
+    image: Image.Image,
+    text: str,
+    font_size: int = DEFAULT_FONT_SIZE,
+    font_family: str = DEFAULT_FONT_FAMILY,
+    text_color: Tuple[int, int, int, int] = TEXT_COLOR,
+    bg_color: Tuple[int, int, int, int] = TEXT_BACKGROUND_COLOR
+) -> Image.Image:
+    """
+    Add a text label below the passport image.
+
+    Args:
+        image: PIL Image object (the passport cover)
+        text: String to display (country name)
+        font_size: Size of the font in pixels
+        font_family: Font family name (must be installed on system)
+        text_color: RGBA tuple for text color
+        bg_color: RGBA tuple for background color
+
+    Returns:
+        New PIL Image with text label below the passport image
+    """
+    font = load_label_font(font_family, get_label_font_size(text, font_size))
+
     # Calculate text size using textbbox
     draw_temp = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
     text_bbox = draw_temp.textbbox((0, 0), text, font=font)
@@ -162,6 +193,36 @@ def add_text_label_to_image(
     return new_image
 
 
+def load_title_font(title_font_family: str, title_font_size: int) -> ImageFont.ImageFont:
+    """Load the title font, trying common name and path variations before PIL's default font."""
+    # Try to load the specified font with multiple fallback strategies
+    font = None
+    font_variations = [
+        title_font_family,  # Try as-is first
+        title_font_family.replace(" ", ""),  # Try without spaces (e.g., "Lithos Pro" -> "LithosPro")
+        f"{title_font_family.replace(' ', '')}-Regular",  # Add -Regular suffix
+        f"/Library/Fonts/{title_font_family.replace(' ', '')}-Regular.otf",  # Library fonts
+        f"/Library/Fonts/{title_font_family.replace(' ', '')}.otf",
+        f"/System/Library/Fonts/Supplemental/{title_font_family}.ttf",
+        f"/System/Library/Fonts/Supplemental/{title_font_family.replace('-Bold', '')}.ttf",
+        "/System/Library/Fonts/Helvetica.ttc",  # Final fallback
+    ]
+
+    for font_path in font_variations:
+        try:
+            font = ImageFont.truetype(font_path, title_font_size)
+            break  # Success! Stop trying
+        except:
+            continue
+
+    if font is None:
+        # Use default font as last resort
+        font = ImageFont.load_default()
+        print(f"Warning: Could not load title font '{title_font_family}', using default font")
+
+    return font
+
+
 def create_title_row(
     width: int,
     title: str,
@@ -189,30 +250,7 @@ def create_title_row(
     # Create the title image
     title_image = Image.new("RGBA", (width, title_height), title_bg_color)
 
-    # Try to load the specified font with multiple fallback strategies
-    font = None
-    font_variations = [
-        title_font_family,  # Try as-is first
-        title_font_family.replace(" ", ""),  # Try without spaces (e.g., "Lithos Pro" -> "LithosPro")
-        f"{title_font_family.replace(' ', '')}-Regular",  # Add -Regular suffix
-        f"/Library/Fonts/{title_font_family.replace(' ', '')}-Regular.otf",  # Library fonts
-        f"/Library/Fonts/{title_font_family.replace(' ', '')}.otf",
-        f"/System/Library/Fonts/Supplemental/{title_font_family}.ttf",
-        f"/System/Library/Fonts/Supplemental/{title_font_family.replace('-Bold', '')}.ttf",
-        "/System/Library/Fonts/Helvetica.ttc",  # Final fallback
-    ]
-
-    for font_path in font_variations:
-        try:
-            font = ImageFont.truetype(font_path, title_font_size)
-            break  # Success! Stop trying
-        except:
-            continue
-
-    if font is None:
-        # Use default font as last resort
-        font = ImageFont.load_default()
-        print(f"Warning: Could not load title font '{title_font_family}', using default font")
+    font = load_title_font(title_font_family, title_font_size)
 
     # Calculate text size and position
     draw = ImageDraw.Draw(title_image)
@@ -230,6 +268,31 @@ def create_title_row(
     return title_image
 
 
+def load_footer_font(footer_font_family: str, footer_font_size: int) -> ImageFont.ImageFont:
+    """Load the footer font, falling back to Arial and then PIL's default font."""
+    # Try to load the specified font with fallback strategies
+    font = None
+    font_variations = [
+        footer_font_family,  # Try as-is first
+        f"/System/Library/Fonts/Supplemental/{footer_font_family}.ttf",
+        "/System/Library/Fonts/Supplemental/Arial.ttf",  # Final fallback
+    ]
+
+    for font_path in font_variations:
+        try:
+            font = ImageFont.truetype(font_path, footer_font_size)
+            break  # Success! Stop trying
+        except:
+            continue
+
+    if font is None:
+        # Use default font as last resort
+        font = ImageFont.load_default()
+        print(f"Warning: Could not load footer font '{footer_font_family}', using default font")
+
+    return font
+
+
 def create_footer_row(
     width: int,
     footer_text: str,
@@ -261,25 +324,7 @@ def create_footer_row(
     # Create the footer image
     footer_image = Image.new("RGBA", (width, footer_height), footer_bg_color)
 
-    # Try to load the specified font with fallback strategies
-    font = None
-    font_variations = [
-        footer_font_family,  # Try as-is first
-        f"/System/Library/Fonts/Supplemental/{footer_font_family}.ttf",
-        "/System/Library/Fonts/Supplemental/Arial.ttf",  # Final fallback
-    ]
-
-    for font_path in font_variations:
-        try:
-            font = ImageFont.truetype(font_path, footer_font_size)
-            break  # Success! Stop trying
-        except:
-            continue
-
-    if font is None:
-        # Use default font as last resort
-        font = ImageFont.load_default()
-        print(f"Warning: Could not load footer font '{footer_font_family}', using default font")
+    font = load_footer_font(footer_font_family, footer_font_size)
 
     # Calculate text size and position
     draw = ImageDraw.Draw(footer_image)
@@ -377,6 +422,57 @@ def get_processed_image_from_path(image_path: str) -> Image.Image:
     return resized_image
 
 
+def build_row_image(
+    row_paths: List[str],
+    add_labels: bool = True,
+    font_size: int = DEFAULT_FONT_SIZE,
+    font_family: str = DEFAULT_FONT_FAMILY,
+    text_color: Tuple[int, int, int, int] = TEXT_COLOR,
+    horizontal_spacing: int = DEFAULT_HORIZONTAL_SPACING,
+    background_color: Tuple[int, int, int, int] = DEFAULT_BACKGROUND_COLOR
+) -> Image.Image:
+    """
+    Build one poster row by merging the (optionally labeled) passport images left to right.
+
+    Args:
+        row_paths: File paths of the passport images in this row
+        add_labels: Whether to add country name labels below each passport (default: True)
+        font_size: Font size for country labels (default: 40)
+        font_family: Font family for country labels (default: "Arial")
+        text_color: RGBA tuple for text color (default: black)
+        horizontal_spacing: Horizontal spacing in pixels between passport images (default: 0)
+        background_color: RGBA tuple for the poster and label background (default: very light gray)
+
+    Returns:
+        PIL Image object containing the row
+    """
+    row_image = None
+    for image_path in row_paths:
+        country_name = get_country_name_from_path(image_path)
+
+        # Get the processed passport image
+        processed_image = get_processed_image_from_path(image_path)
+
+        # Add text label if requested
+        if add_labels:
+            formatted_name = format_country_name(country_name)
+            processed_image = add_text_label_to_image(
+                processed_image,
+                formatted_name,
+                font_size=font_size,
+                font_family=font_family,
+                text_color=text_color,
+                bg_color=background_color
+            )
+
+        if row_image is None:
+            row_image = processed_image
+        else:
+            row_image = merge_horizontally(row_image, processed_image, horizontal_spacing, background_color)
+
+    return row_image
+
+
 def get_poster(
     images_per_row: int,
     image_paths: List[str],
@@ -402,7 +498,8 @@ def get_poster(
     footer_bg_color: Tuple[int, int, int, int] = FOOTER_BACKGROUND_COLOR,
     footer_left_margin: int = FOOTER_LEFT_MARGIN,
     left_margin: int = DEFAULT_LEFT_MARGIN,
-    right_margin: int = DEFAULT_RIGHT_MARGIN
+    right_margin: int = DEFAULT_RIGHT_MARGIN,
+    num_workers: int = 1
 ) -> Image.Image:
     """
     Create a poster from passport cover images.
@@ -433,6 +530,9 @@ def get_poster(
         footer_left_margin: Left margin for footer text in pixels (default: 40)
         left_margin: Left margin of the poster in pixels (default: 5)
         right_margin: Right margin of the poster in pixels (default: 5)
+        num_workers: Number of worker processes; above 1 the rows are rendered in parallel
+            bands by get_poster_sharded (default: 1). Posters with a single row or a
+            translucent background_color are always rendered in one process.
 
     Returns:
         PIL Image object containing the assembled poster
@@ -441,44 +541,54 @@ def get_poster(
     num_rows = len(image_paths) / images_per_row
     print(f"Grid: {images_per_row} columns × {int(num_rows + 0.5)} rows")
 
-    row_images = []
-    elements_in_row_so_far = 0
-    current_row_image = None
-
-    for image_path in image_paths:
-        country_name = get_country_name_from_path(image_path)
-
-        # Get the processed passport image
-        processed_image = get_processed_image_from_path(image_path)
-
-        # Add text label if requested
-        if add_labels:
-            formatted_name = format_country_name(country_name)
-            processed_image = add_text_label_to_image(
-                processed_image,
-                formatted_name,
+    # Translucent backgrounds change on every merge, so only opaque ones (RGB or alpha 255) are sharded
+    if num_workers > 1 and num_rows > 1 and (len(background_color) == 3 or background_color[3] == 255):
+        return get_poster_sharded(
+            images_per_row,
+            image_paths,
+            num_workers,
+            row_options=dict(
+                add_labels=add_labels,
                 font_size=font_size,
                 font_family=font_family,
                 text_color=text_color,
-                bg_color=background_color
-            )
-
-        # Build rows horizontally
-        if current_row_image is None:
-            current_row_image = processed_image
-            elements_in_row_so_far = 1
-        elif elements_in_row_so_far < images_per_row:
-            current_row_image = merge_horizontally(current_row_image, processed_image, horizontal_spacing, background_color)
-            elements_in_row_so_far += 1
-        else:
-            # Start new row
-            row_images.append(current_row_image)
-            current_row_image = processed_image
-            elements_in_row_so_far = 1
+                horizontal_spacing=horizontal_spacing,
+                background_color=background_color
+            ),
+            title_options=dict(
+                title=title,
+                title_height=title_height,
+                title_font_size=title_font_size,
+                title_font_family=title_font_family,
+                title_text_color=title_text_color,
+                title_bg_color=title_bg_color
+            ) if title else None,
+            footer_options=dict(
+                footer_text=footer_text,
+                footer_height=footer_height,
+                footer_font_size=footer_font_size,
+                footer_font_family=footer_font_family,
+                footer_text_color=footer_text_color,
+                footer_bg_color=footer_bg_color,
+                footer_left_margin=footer_left_margin
+            ) if footer_text else None,
+            vertical_spacing=vertical_spacing,
+            background_color=background_color,
+            left_margin=left_margin,
+            right_margin=right_margin
+        )
 
-    # Add the last row if it exists
-    if current_row_image is not None:
-        row_images.append(current_row_image)
+    row_images = []
+    for row_start in range(0, len(image_paths), images_per_row):
+        row_images.append(build_row_image(
+            image_paths[row_start:row_start + images_per_row],
+            add_labels=add_labels,
+            font_size=font_size,
+            font_family=font_family,
+            text_color=text_color,
+            horizontal_spacing=horizontal_spacing,
+            background_color=background_color
+        ))
 
     # Merge all rows vertically
     poster = None
@@ -540,6 +650,824 @@ def get_poster(
     return poster
 
 
+def flatten_onto_background(image: Image.Image, times: int, background_color: Tuple[int, int, int, int]) -> Image.Image:
+    """
+    Composite an image onto the background as many times as the merge chain in get_poster would.
+
+    Every merge_vertically call and the final margin step re-paste the poster onto a fresh
+    background using its own alpha channel as mask. Applying the same pastes to a band up front
+    lets it be copied into the final canvas as-is and still match a single-process render.
+
+    Args:
+        image: Row, band, title or footer image
+        times: Number of merges the image goes through in a single-process render
+        background_color: RGBA tuple for the poster background (must be opaque)
+
+    Returns:
+        Image with the pixels it would have in the single-process poster
+    """
+    for _ in range(times):
+        # Fully opaque images are copied unchanged by every further merge
+        if image.mode == 'RGBA' and image.getchannel('A').getextrema() == (255, 255):
+            break
+
+        flattened = Image.new("RGBA", image.size, background_color)
+        if image.mode == 'RGBA':
+            flattened.paste(image, (0, 0), image)
+        else:
+            flattened.paste(image, (0, 0))
+        image = flattened
+
+    return image
+
+
+def render_row_band(
+    band_paths: List[str],
+    images_per_row: int,
+    first_row_index: int,
+    num_rows: int,
+    extra_merges: int,
+    vertical_spacing: int,
+    row_options: dict
+) -> Image.Image:
+    """
+    Render a horizontal band of consecutive poster rows (worker process entry point).
+
+    Args:
+        band_paths: File paths of the passport images in this band, in poster order
+        images_per_row: Number of passport images per row
+        first_row_index: Index of the band's first row within the whole poster
+        num_rows: Total number of rows in the poster
+        extra_merges: Merges applied after the rows are stacked (title, footer, margins)
+        vertical_spacing: Vertical spacing in pixels between rows
+        row_options: Keyword arguments for build_row_image
+
+    Returns:
+        PIL Image object containing the band, ready to be copied into the poster
+    """
+    background_color = row_options["background_color"]
+
+    rows = []
+    for row_offset, row_start in enumerate(range(0, len(band_paths), images_per_row)):
+        row_index = first_row_index + row_offset
+        row_image = build_row_image(band_paths[row_start:row_start + images_per_row], **row_options)
+
+        # The first row is the seed of the vertical merge chain; every later row joins it once
+        row_merges = num_rows - 1 if row_index == 0 else num_rows - row_index
+        rows.append(flatten_onto_background(row_image, row_merges + extra_merges, background_color))
+
+    band_width = max(row.size[0] for row in rows)
+    band_height = sum(row.size[1] for row in rows) + vertical_spacing * (len(rows) - 1)
+    band = Image.new("RGBA", (band_width, band_height), background_color)
+
+    y = 0
+    for row in rows:
+        band.paste(row, (0, y))
+        y += row.size[1] + vertical_spacing
+
+    return band
+
+
+def get_poster_sharded(
+    images_per_row: int,
+    image_paths: List[str],
+    num_workers: int,
+    row_options: dict,
+    title_options: dict = None,
+    footer_options: dict = None,
+    vertical_spacing: int = DEFAULT_VERTICAL_SPACING,
+    background_color: Tuple[int, int, int, int] = DEFAULT_BACKGROUND_COLOR,
+    left_margin: int = DEFAULT_LEFT_MARGIN,
+    right_margin: int = DEFAULT_RIGHT_MARGIN
+) -> Image.Image:
+    """
+    Create a poster by rendering horizontal row bands in separate worker processes.
+
+    The bands are stitched into the final canvas with a single copy each, and the output is
+    pixel-identical to the single-process get_poster render. Usually called through
+    get_poster(..., num_workers=N) rather than directly.
+
+    Args:
+        images_per_row: Number of passport images per row
+        image_paths: List of file paths to passport images
+        num_workers: Number of worker processes (one band per worker)
+        row_options: Keyword arguments for build_row_image
+        title_options: Keyword arguments for create_title_row without width, or None for no title
+        footer_options: Keyword arguments for create_footer_row without width, or None for no footer
+        vertical_spacing: Vertical spacing in pixels between rows (default: 0)
+        background_color: RGBA tuple for overall poster background color (must be opaque)
+        left_margin: Left margin of the poster in pixels (default: 5)
+        right_margin: Right margin of the poster in pixels (default: 5)
+
+    Returns:
+        PIL Image object containing the assembled poster
+    """
+    num_rows = (len(image_paths) + images_per_row - 1) // images_per_row
+    rows_per_band = (num_rows + num_workers - 1) // num_workers
+    has_margins = left_margin > 0 or right_margin > 0
+
+    # Merges that follow the row chain in get_poster: title on top, footer below, then margins
+    extra_merges = int(bool(title_options)) + int(bool(footer_options)) + int(has_margins)
+
+    band_starts = list(range(0, num_rows, rows_per_band))
+    print(f"Rendering {len(band_starts)} bands of up to {rows_per_band} rows on {num_workers} workers...")
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        # executor.map drops each future once its band is yielded, so `bands` holds the only reference
+        bands = list(executor.map(
+            render_row_band,
+            [image_paths[first_row * images_per_row:(first_row + rows_per_band) * images_per_row] for first_row in band_starts],
+            [images_per_row] * len(band_starts),
+            band_starts,
+            [num_rows] * len(band_starts),
+            [extra_merges] * len(band_starts),
+            [vertical_spacing] * len(band_starts),
+            [row_options] * len(band_starts)
+        ))
+
+    grid_width = max(band.size[0] for band in bands)
+    grid_height = sum(band.size[1] for band in bands) + vertical_spacing * (len(bands) - 1)
+
+    title_row = None
+    if title_options:
+        print(f"Adding title: '{title_options['title']}'")
+        title_row = flatten_onto_background(
+            create_title_row(width=grid_width, **title_options),
+            1 + int(bool(footer_options)) + int(has_margins),
+            background_color
+        )
+
+    footer_row = None
+    if footer_options:
+        print(f"Adding footer: '{footer_options['footer_text']}'")
+        footer_row = flatten_onto_background(
+            create_footer_row(width=grid_width, **footer_options),
+            1 + int(has_margins),
+            background_color
+        )
+
+    title_height = title_row.size[1] if title_row else 0
+    footer_height = footer_row.size[1] if footer_row else 0
+    if not has_margins:
+        left_margin, right_margin = 0, 0
+
+    poster = Image.new(
+        "RGBA",
+        (grid_width + left_margin + right_margin, title_height + grid_height + footer_height),
+        background_color
+    )
+
+    if title_row:
+        poster.paste(title_row, (left_margin, 0))
+
+    y = title_height
+    while bands:
+        band = bands.pop(0)
+        poster.paste(band, (left_margin, y))
+        y += band.size[1] + vertical_spacing
+
+    if footer_row:
+        poster.paste(footer_row, (left_margin, title_height + grid_height))
+
+    print(f"Poster created! Size: {poster.size[0]}×{poster.size[1]} pixels")
+    return poster
+
+
+def register_pdf_font(font: ImageFont.ImageFont, fallback_font_name: str) -> str:
+    """
+    Register the file behind a loaded PIL font with reportlab and return its PDF font name.
+
+    TrueType fonts are embedded in the PDF. Fonts reportlab cannot embed (CFF-based .otf
+    files, PIL's built-in default font) are replaced with a standard PDF font.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    font_path = getattr(font, "path", None)
+    if not isinstance(font_path, str):
+        return fallback_font_name
+
+    font_index = getattr(font, "index", 0)
+    pdf_font_name = f"{os.path.splitext(os.path.basename(font_path))[0]}-{font_index}"
+    if pdf_font_name not in pdfmetrics.getRegisteredFontNames():
+        try:
+            pdfmetrics.registerFont(TTFont(pdf_font_name, font_path, subfontIndex=font_index))
+        except Exception:
+            print(f"Warning: Could not embed font '{font_path}' in PDF, using {fallback_font_name}")
+            return fallback_font_name
+
+    return pdf_font_name
+
+
+def measure_pdf_text(text: str, font: ImageFont.ImageFont, pdf_font_name: str, font_size: int) -> Tuple[int, int, float]:
+    """
+    Measure text the way the raster renderer does, in poster pixels.
+
+    Heights and ascent always come from the PIL font, so the PDF layout matches get_poster
+    even when a standard PDF font stands in for a font that could not be embedded. Only the
+    width (used for centering) is measured with the stand-in font.
+
+    Returns:
+        Tuple of (text_width, text_height, ascent), matching the textbbox measurements used by
+        add_text_label_to_image, create_title_row and create_footer_row
+    """
+    from reportlab.pdfbase import pdfmetrics
+
+    draw_temp = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    text_bbox = draw_temp.textbbox((0, 0), text, font=font)
+    text_width = text_bbox[2] - text_bbox[0]
+    text_height = text_bbox[3] - text_bbox[1]
+    ascent = font.getmetrics()[0] if hasattr(font, "getmetrics") else text_bbox[3]
+
+    if pdf_font_name in (PDF_FALLBACK_FONT, PDF_FALLBACK_BOLD_FONT):
+        # The stand-in font has its own widths; center it within the same space
+        text_width = int(pdfmetrics.stringWidth(text, pdf_font_name, font_size))
+
+    return text_width, text_height, ascent
+
+
+def save_poster_pdf(
+    output_path: str,
+    images_per_row: int,
+    image_paths: List[str],
+    add_labels: bool = True,
+    font_size: int = DEFAULT_FONT_SIZE,
+    font_family: str = DEFAULT_FONT_FAMILY,
+    text_color: Tuple[int, int, int, int] = TEXT_COLOR,
+    title: str = None,
+    title_height: int = DEFAULT_TITLE_HEIGHT,
+    title_font_size: int = DEFAULT_TITLE_FONT_SIZE,
+    title_font_family: str = DEFAULT_TITLE_FONT_FAMILY,
+    title_text_color: Tuple[int, int, int, int] = TITLE_TEXT_COLOR,
+    title_bg_color: Tuple[int, int, int, int] = TITLE_BACKGROUND_COLOR,
+    horizontal_spacing: int = DEFAULT_HORIZONTAL_SPACING,
+    vertical_spacing: int = DEFAULT_VERTICAL_SPACING,
+    background_color: Tuple[int, int, int, int] = DEFAULT_BACKGROUND_COLOR,
+    footer_text: str = None,
+    footer_height: int = DEFAULT_FOOTER_HEIGHT,
+    footer_font_size: int = DEFAULT_FOOTER_FONT_SIZE,
+    footer_font_family: str = DEFAULT_FOOTER_FONT_FAMILY,
+    footer_text_color: Tuple[int, int, int, int] = FOOTER_TEXT_COLOR,
+    footer_bg_color: Tuple[int, int, int, int] = FOOTER_BACKGROUND_COLOR,
+    footer_left_margin: int = FOOTER_LEFT_MARGIN,
+    left_margin: int = DEFAULT_LEFT_MARGIN,
+    right_margin: int = DEFAULT_RIGHT_MARGIN,
+    dpi: int = DEFAULT_PDF_DPI
+) -> None:
+    """
+    Save a poster as a PDF with the same layout as get_poster, without rasterizing it.
+
+    Each processed passport cover is embedded once as an image at its cell position, and the
+    labels, title and footer are drawn as vector text with the same fonts get_poster resolves.
+    The full poster canvas is never allocated, and covers stay compressed until they are drawn.
+    Cell sizes always come from the PIL fonts; if a font cannot be embedded and Helvetica is
+    drawn instead, the layout is unchanged but the glyphs differ. Requires reportlab
+    (pip install reportlab).
+
+    Args:
+        output_path: Path of the PDF file to write
+        dpi: Print resolution; one poster pixel becomes 1/dpi inch on the page (default: 300)
+
+        All other arguments are the same as for get_poster.
+    """
+    try:
+        from reportlab.lib.colors import Color
+        from reportlab.lib.utils import ImageReader
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        raise ImportError("PDF output requires reportlab: pip install reportlab") from None
+
+    def pdf_color(rgba: Tuple[int, int, int, int]) -> Color:
+        return Color(rgba[0] / 255, rgba[1] / 255, rgba[2] / 255, alpha=rgba[3] / 255)
+
+    print(f"Creating PDF poster with {len(image_paths)} passport covers")
+    scale = 72 / dpi
+
+    # Process every cover once and keep it compressed until it is placed on the page
+    cells = []
+    label_fonts = {}
+    for image_path in image_paths:
+        processed_image = get_processed_image_from_path(image_path)
+        cell = {"size": processed_image.size, "height": processed_image.size[1]}
+
+        if processed_image.mode in ("RGBA", "LA", "P") and processed_image.convert("RGBA").getchannel('A').getextrema()[0] < 255:
+            # Keep transparent covers PNG-compressed (with alpha) until they are drawn
+            png_data = io.BytesIO()
+            processed_image.convert("RGBA").save(png_data, "PNG")
+            png_data.seek(0)
+            cell["image"] = png_data
+        else:
+            jpeg_data = io.BytesIO()
+            processed_image.convert("RGB").save(jpeg_data, "JPEG", quality=PDF_COVER_JPEG_QUALITY)
+            jpeg_data.seek(0)
+            cell["image"] = jpeg_data
+
+        if add_labels:
+            label = format_country_name(get_country_name_from_path(image_path))
+            label_font_size = get_label_font_size(label, font_size)
+            if label_font_size not in label_fonts:
+                font = load_label_font(font_family, label_font_size)
+                label_fonts[label_font_size] = (font, register_pdf_font(font, PDF_FALLBACK_BOLD_FONT))
+            font, pdf_font_name = label_fonts[label_font_size]
+            text_width, text_height, ascent = measure_pdf_text(label, font, pdf_font_name, label_font_size)
+            cell.update(
+                label=label,
+                label_font=(pdf_font_name, label_font_size),
+                label_position=((processed_image.size[0] - text_width) // 2, processed_image.size[1] + TEXT_PADDING + ascent),
+                height=processed_image.size[1] + text_height + TEXT_PADDING + TEXT_BOTTOM_MARGIN
+            )
+        cells.append(cell)
+
+    # Lay out the grid exactly like the merge chain in get_poster
+    rows = [cells[row_start:row_start + images_per_row] for row_start in range(0, len(cells), images_per_row)]
+    row_heights = [max(cell["height"] for cell in row) for row in rows]
+    grid_width = max(
+        sum(cell["size"][0] for cell in row) + horizontal_spacing * (len(row) - 1)
+        for row in rows
+    )
+    grid_height = sum(row_heights) + vertical_spacing * (len(rows) - 1)
+
+    title_offset = title_height if title else 0
+    footer_offset = footer_height if footer_text else 0
+    if not (left_margin > 0 or right_margin > 0):
+        left_margin, right_margin = 0, 0
+    page_width = grid_width + left_margin + right_margin
+    page_height = title_offset + grid_height + footer_offset
+
+    pdf = canvas.Canvas(output_path, pagesize=(page_width * scale, page_height * scale))
+    pdf.setTitle(title or "Passport Poster")
+
+    def fill_rect(x: int, y: int, width: int, height: int, rgba: Tuple[int, int, int, int]):
+        pdf.setFillColor(pdf_color(rgba))
+        pdf.rect(x * scale, (page_height - y - height) * scale, width * scale, height * scale, stroke=0, fill=1)
+
+    def draw_text(text: str, x: int, baseline_y: float, pdf_font_name: str, size: int, rgba: Tuple[int, int, int, int]):
+        pdf.setFont(pdf_font_name, size * scale)
+        pdf.setFillColor(pdf_color(rgba))
+        pdf.drawString(x * scale, (page_height - baseline_y) * scale, text)
+
+    fill_rect(0, 0, page_width, page_height, background_color)
+
+    if title:
+        print(f"Adding title: '{title}'")
+        fill_rect(left_margin, 0, grid_width, title_height, title_bg_color)
+        font = load_title_font(title_font_family, title_font_size)
+        pdf_font_name = register_pdf_font(font, PDF_FALLBACK_BOLD_FONT)
+        text_width, text_height, ascent = measure_pdf_text(title, font, pdf_font_name, title_font_size)
+        text_x = left_margin + (grid_width - text_width) // 2
+        text_y = (title_height - text_height) // 2
+        draw_text(title, text_x, text_y + ascent, pdf_font_name, title_font_size, title_text_color)
+
+    y = title_offset
+    for row, row_height in zip(rows, row_heights):
+        x = left_margin
+        for cell in row:
+            cell_width, cell_height = cell["size"]
+            pdf.drawImage(
+                ImageReader(cell.pop("image")),
+                x * scale,
+                (page_height - y - cell_height) * scale,
+                cell_width * scale,
+                cell_height * scale,
+                mask='auto'
+            )
+            if "label" in cell:
+                label_x, label_baseline = cell["label_position"]
+                draw_text(cell["label"], x + label_x, y + label_baseline, *cell["label_font"], text_color)
+            x += cell_width + horizontal_spacing
+        y += row_height + vertical_spacing
+
+    if footer_text:
+        print(f"Adding footer: '{footer_text}'")
+        footer_y = title_offset + grid_height
+        fill_rect(left_margin, footer_y, grid_width, footer_height, footer_bg_color)
+        font = load_footer_font(footer_font_family, footer_font_size)
+        pdf_font_name = register_pdf_font(font, PDF_FALLBACK_FONT)
+        text_width, text_height, ascent = measure_pdf_text(footer_text, font, pdf_font_name, footer_font_size)
+        text_y = footer_y + (footer_height - text_height) // 2
+        draw_text(footer_text, left_margin + footer_left_margin, text_y + ascent, pdf_font_name, footer_font_size, footer_text_color)
+
+    pdf.showPage()
+    pdf.save()
+    print(f"PDF poster saved! Size: {page_width / dpi:.1f}\"×{page_height / dpi:.1f}\" at {dpi} dpi")
+
+
+def compute_ssim(image_a: Image.Image, image_b: Image.Image) -> float:
+    """
+    Compute the mean structural similarity (SSIM) of two images of the same size.
+
+    Uses the luminance channel and a uniform 8×8 window, which is plenty to compare a
+    compressed tile against its original.
+    """
+    window = 8
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+
+    def window_means(values: np.ndarray) -> np.ndarray:
+        # Mean of every window × window patch, from a summed-area table
+        table = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+        sums = table[window:, window:] - table[:-window, window:] - table[window:, :-window] + table[:-window, :-window]
+        return sums / (window * window)
+
+    a = np.asarray(image_a.convert("L"), dtype=np.float64)
+    b = np.asarray(image_b.convert("L"), dtype=np.float64)
+    mean_a = window_means(a)
+    mean_b = window_means(b)
+    var_a = window_means(a * a) - mean_a ** 2
+    var_b = window_means(b * b) - mean_b ** 2
+    covariance = window_means(a * b) - mean_a * mean_b
+
+    ssim_map = ((2 * mean_a * mean_b + c1) * (2 * covariance + c2)) / (
+        (mean_a ** 2 + mean_b ** 2 + c1) * (var_a + var_b + c2)
+    )
+    return float(ssim_map.mean())
+
+
+def get_sample_tiles(image: Image.Image) -> List[Image.Image]:
+    """Cut SAMPLE_TILE_GRID evenly spread, block-aligned tiles out of an image for quality estimates."""
+    width, height = image.size
+    tile_width = min(SAMPLE_TILE_SIZE, width)
+    tile_height = min(SAMPLE_TILE_SIZE, height)
+    columns, rows = SAMPLE_TILE_GRID
+
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            # Centre each tile in its grid cell, aligned to 16 px so JPEG blocks line up with the full image
+            x = (width * (2 * column + 1) // (2 * columns) - tile_width // 2) // 16 * 16
+            y = (height * (2 * row + 1) // (2 * rows) - tile_height // 2) // 16 * 16
+            x = max(0, min(x, width - tile_width))
+            y = max(0, min(y, height - tile_height))
+            tiles.append(image.crop((x, y, x + tile_width, y + tile_height)))
+    return tiles
+
+
+def save_poster_with_target(
+    poster: Image.Image,
+    output_path: str,
+    max_bytes: int = None,
+    target_ssim: float = None,
+    image_format: str = "JPEG",
+    max_quality: int = DEFAULT_EXPORT_QUALITY,
+    min_quality: int = MIN_EXPORT_QUALITY
+) -> Tuple[int, int]:
+    """
+    Save a poster as JPEG or WebP at the highest quality that fits a file size or SSIM target.
+
+    The quality is found by a binary search on small sample tiles of the poster, encoded in
+    parallel; the full poster is encoded only once, at the chosen quality. With max_bytes the
+    highest quality whose estimated size fits is chosen; with target_ssim the lowest quality
+    whose tiles reach that SSIM. With both, the SSIM quality is used unless it would exceed
+    the size limit.
+
+    Args:
+        poster: PIL Image object returned by get_poster
+        output_path: Path of the image file to write
+        max_bytes: Maximum file size in bytes (default: None)
+        target_ssim: Minimum mean SSIM against the uncompressed poster, e.g. 0.98 (default: None)
+        image_format: "JPEG" or "WEBP" (default: "JPEG")
+        max_quality: Highest quality to consider (default: 95)
+        min_quality: Lowest quality to consider (default: 10)
+
+    Returns:
+        Tuple of (chosen quality, file size in bytes)
+    """
+    if max_bytes is None and target_ssim is None:
+        raise ValueError("Provide max_bytes, target_ssim or both")
+
+    image = poster.convert("RGB")
+    tiles = get_sample_tiles(image)
+    tile_area = sum(tile.size[0] * tile.size[1] for tile in tiles)
+    area_ratio = image.size[0] * image.size[1] / tile_area
+
+    def encode(tile: Image.Image, quality: int) -> bytes:
+        encoded = io.BytesIO()
+        tile.save(encoded, image_format, quality=quality)
+        return encoded.getvalue()
+
+    estimates = {}
+
+    def estimate(quality: int) -> Tuple[int, float]:
+        """Estimate the full-size file size and mean tile SSIM at a quality."""
+        if quality not in estimates:
+            with ThreadPoolExecutor() as executor:
+                encoded_tiles = list(executor.map(lambda tile: encode(tile, quality), tiles))
+            # Every tile carries its own headers, which the full image only has once
+            header_bytes = len(encode(Image.new("RGB", (16, 16)), quality))
+            payload_bytes = sum(len(data) for data in encoded_tiles) - header_bytes * len(tiles)
+            estimated_bytes = int(payload_bytes * area_ratio) + header_bytes
+
+            ssim = None
+            if target_ssim is not None:
+                with ThreadPoolExecutor() as executor:
+                    ssim_values = list(executor.map(
+                        lambda pair: compute_ssim(pair[0], Image.open(io.BytesIO(pair[1]))),
+                        zip(tiles, encoded_tiles)
+                    ))
+                ssim = sum(ssim_values) / len(ssim_values)
+            estimates[quality] = (estimated_bytes, ssim)
+        return estimates[quality]
+
+    def search(fits) -> int:
+        """Return the highest quality for which fits(quality) holds, assuming it holds below it."""
+        low, high = min_quality, max_quality
+        if not fits(low):
+            return low
+        while low < high:
+            middle = (low + high + 1) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    quality = max_quality
+    if max_bytes is not None:
+        quality = search(lambda q: estimate(q)[0] <= max_bytes * SIZE_ESTIMATE_MARGIN)
+    if target_ssim is not None:
+        # Lowest quality reaching the SSIM target = one above the highest quality that misses it
+        below_target = search(lambda q: estimate(q)[1] < target_ssim)
+        ssim_quality = min_quality if estimate(min_quality)[1] >= target_ssim else min(below_target + 1, max_quality)
+        quality = min(quality, ssim_quality)
+
+    image.save(output_path, image_format, quality=quality)
+    file_size = os.path.getsize(output_path)
+    estimated_bytes, ssim = estimate(quality)
+
+    print(f"Saved: {output_path} ({image_format} quality {quality}, {file_size / 1e6:.2f} MB, estimated {estimated_bytes / 1e6:.2f} MB)")
+    if ssim is not None:
+        print(f"  Estimated SSIM: {ssim:.4f} (target {target_ssim})")
+        if ssim < target_ssim:
+            print(f"Warning: {output_path} misses the SSIM target {target_ssim} (estimated {ssim:.4f} at quality {quality})")
+    if max_bytes is not None and file_size > max_bytes:
+        print(f"Warning: {output_path} is {file_size - max_bytes} bytes over the {max_bytes} byte limit")
+    return quality, file_size
+
+
+class PosterSession:
+    """
+    Keep poster layers in memory so interactive (notebook) previews only redo what changed.
+
+    Cover sizes, preview-scale covers, label strips, fonts and the grid layout are cached
+    between calls; full-resolution covers are decoded only to build the previews.
+    update() re-renders only the layers the changed parameters affect (relabel, relayout,
+    or a title- or footer-only redraw) and returns a downscaled preview. render() builds
+    the full-resolution poster with get_poster.
+
+    Example:
+        session = PosterSession(all_paths, images_per_row=20, title="Passports of the World")
+        session.preview()
+        session.update(horizontal_spacing=30)  # relayout, labels and covers are reused
+        session.update(title="Passports")      # title redraw only
+        poster = session.render()
+    """
+
+    # Poster parameters grouped by the layers they invalidate; margins only affect the final assembly
+    LABEL_PARAMETERS = ("add_labels", "font_size", "font_family", "text_color", "background_color")
+    LAYOUT_PARAMETERS = ("images_per_row", "horizontal_spacing", "vertical_spacing")
+    TITLE_PARAMETERS = ("title", "title_height", "title_font_size", "title_font_family", "title_text_color", "title_bg_color")
+    FOOTER_PARAMETERS = (
+        "footer_text", "footer_height", "footer_font_size", "footer_font_family",
+        "footer_text_color", "footer_bg_color", "footer_left_margin"
+    )
+    MARGIN_PARAMETERS = ("left_margin", "right_margin")
+
+    def __init__(self, image_paths: List[str], images_per_row: int, preview_scale: float = DEFAULT_PREVIEW_SCALE, **params):
+        """
+        Args:
+            image_paths: List of file paths to passport images
+            images_per_row: Number of passport images per row
+            preview_scale: Preview pixels per poster pixel (default: 0.15)
+            **params: Any other get_poster parameter (font_size, title, horizontal_spacing, ...)
+        """
+        parameter_names = (
+            self.LABEL_PARAMETERS + self.LAYOUT_PARAMETERS + self.TITLE_PARAMETERS
+            + self.FOOTER_PARAMETERS + self.MARGIN_PARAMETERS
+        )
+        get_poster_defaults = inspect.signature(get_poster).parameters
+        self.params = {
+            name: get_poster_defaults[name].default
+            for name in parameter_names if name != "images_per_row"
+        }
+        self.params["images_per_row"] = images_per_row
+        self.image_paths = list(image_paths)
+        self.preview_scale = preview_scale
+
+        self.cover_sizes = {}  # path -> size of the processed full-resolution cover
+        self.preview_covers = {}  # path -> processed cover at preview scale
+        self.label_strips = {}  # path -> (full-resolution label height, label strip at preview scale)
+        self.fonts = {}  # (loader, family, size) -> font
+        self.layout = None
+        self.grid_preview = None
+        self.title_preview = None
+        self.footer_preview = None
+        self.dirty = {"layout", "grid", "title", "footer"}
+        self.measure_draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+        self.update(**params)
+
+    def update(self, image_paths: List[str] = None, preview_scale: float = None, **params) -> Image.Image:
+        """
+        Change poster parameters and return the updated preview.
+
+        Args:
+            image_paths: New list of passport image paths; covers already loaded are reused and
+                covers no longer in the list are dropped from the caches
+            preview_scale: New preview scale (re-scales every cached layer)
+            **params: get_poster parameters to change
+
+        Returns:
+            Downscaled PIL Image preview of the poster
+        """
+        for name in params:
+            if name not in self.params:
+                raise TypeError(f"PosterSession.update() got an unexpected parameter '{name}'")
+
+        if image_paths is not None:
+            self.image_paths = list(image_paths)
+            kept_paths = set(self.image_paths)
+            for cache in (self.cover_sizes, self.preview_covers, self.label_strips):
+                for image_path in [path for path in cache if path not in kept_paths]:
+                    del cache[image_path]
+            self.dirty |= {"layout", "grid"}
+
+        if preview_scale is not None and preview_scale != self.preview_scale:
+            self.preview_scale = preview_scale
+            self.preview_covers.clear()
+            self.label_strips.clear()
+            self.dirty |= {"layout", "grid", "title", "footer"}
+
+        for name, value in params.items():
+            if self.params[name] == value:
+                continue
+            self.params[name] = value
+            if name in self.LABEL_PARAMETERS:
+                self.label_strips.clear()
+                self.dirty |= {"layout", "grid"}
+            elif name in self.LAYOUT_PARAMETERS:
+                self.dirty |= {"layout", "grid"}
+            elif name in self.TITLE_PARAMETERS:
+                self.dirty.add("title")
+            elif name in self.FOOTER_PARAMETERS:
+                self.dirty.add("footer")
+
+        return self.preview()
+
+    def preview(self) -> Image.Image:
+        """Return a downscaled preview of the poster, rebuilding only the dirty layers."""
+        for image_path in self.image_paths:
+            self._load_cell(image_path)
+
+        if "layout" in self.dirty:
+            self._compute_layout()
+        if "grid" in self.dirty:
+            self._compose_grid()
+
+        grid_width = self.grid_preview.size[0]
+        if self.params["title"] and ("title" in self.dirty or self.title_preview.size[0] != grid_width):
+            self._draw_title()
+        if self.params["footer_text"] and ("footer" in self.dirty or self.footer_preview.size[0] != grid_width):
+            self._draw_footer()
+        self.dirty.clear()
+
+        return self._assemble_preview()
+
+    def render(self, num_workers: int = 1) -> Image.Image:
+        """Render the full-resolution poster with the current parameters using get_poster."""
+        return get_poster(image_paths=self.image_paths, num_workers=num_workers, **self.params)
+
+    def _scaled(self, value: float) -> int:
+        return int(round(value * self.preview_scale))
+
+    def _get_font(self, loader, font_family: str, font_size: int) -> ImageFont.ImageFont:
+        key = (loader.__name__, font_family, font_size)
+        if key not in self.fonts:
+            self.fonts[key] = loader(font_family, font_size)
+        return self.fonts[key]
+
+    def _load_cell(self, image_path: str):
+        """Make sure the cover size, the cover preview and the label strip are cached."""
+        if image_path not in self.preview_covers:
+            # The full-resolution cover is only needed long enough to record its size and scale it down
+            cover = get_processed_image_from_path(image_path)
+            self.cover_sizes[image_path] = cover.size
+            if cover.mode not in ("RGB", "RGBA"):
+                cover = cover.convert("RGBA")
+            preview_size = (max(1, self._scaled(cover.size[0])), max(1, self._scaled(cover.size[1])))
+            self.preview_covers[image_path] = cover.resize(preview_size, Image.Resampling.BOX)
+
+        if image_path not in self.label_strips:
+            self.label_strips[image_path] = self._draw_label_strip(image_path)
+
+    def _draw_label_strip(self, image_path: str) -> Tuple[int, Image.Image]:
+        """Measure a label at full resolution (for the layout) and draw it at preview scale."""
+        if not self.params["add_labels"]:
+            return 0, None
+
+        label = format_country_name(get_country_name_from_path(image_path))
+        label_font_size = get_label_font_size(label, self.params["font_size"])
+        font = self._get_font(load_label_font, self.params["font_family"], label_font_size)
+        text_bbox = self.measure_draw.textbbox((0, 0), label, font=font)
+        label_height = text_bbox[3] - text_bbox[1] + TEXT_PADDING + TEXT_BOTTOM_MARGIN
+
+        preview_font = self._get_font(load_label_font, self.params["font_family"], max(1, self._scaled(label_font_size)))
+        preview_width = self.preview_covers[image_path].size[0]
+        strip = Image.new("RGBA", (preview_width, max(1, self._scaled(label_height))), self.params["background_color"])
+        draw = ImageDraw.Draw(strip)
+        preview_bbox = draw.textbbox((0, 0), label, font=preview_font)
+        text_x = (preview_width - (preview_bbox[2] - preview_bbox[0])) // 2
+        draw.text((text_x, self._scaled(TEXT_PADDING)), label, font=preview_font, fill=self.params["text_color"])
+
+        return label_height, strip
+
+    def _compute_layout(self):
+        """Place every cell in full-resolution poster coordinates, as get_poster would."""
+        images_per_row = self.params["images_per_row"]
+        horizontal_spacing = self.params["horizontal_spacing"]
+        vertical_spacing = self.params["vertical_spacing"]
+
+        cells = []
+        grid_width = 0
+        y = 0
+        for row_start in range(0, len(self.image_paths), images_per_row):
+            x = 0
+            row_height = 0
+            for image_path in self.image_paths[row_start:row_start + images_per_row]:
+                cover_width, cover_height = self.cover_sizes[image_path]
+                cells.append((image_path, x, y))
+                row_height = max(row_height, cover_height + self.label_strips[image_path][0])
+                x += cover_width + horizontal_spacing
+            grid_width = max(grid_width, x - horizontal_spacing)
+            y += row_height + vertical_spacing
+
+        self.layout = {"cells": cells, "size": (grid_width, y - vertical_spacing)}
+
+    def _compose_grid(self):
+        """Paste the preview covers and label strips at their layout positions."""
+        grid_width, grid_height = self.layout["size"]
+        grid = Image.new("RGBA", (self._scaled(grid_width), self._scaled(grid_height)), self.params["background_color"])
+
+        for image_path, x, y in self.layout["cells"]:
+            cover = self.preview_covers[image_path]
+            position = (self._scaled(x), self._scaled(y))
+            if cover.mode == 'RGBA':
+                grid.paste(cover, position, cover)
+            else:
+                grid.paste(cover, position)
+
+            strip = self.label_strips[image_path][1]
+            if strip is not None:
+                grid.paste(strip, (position[0], position[1] + cover.size[1]))
+
+        self.grid_preview = grid
+
+    def _draw_title(self):
+        self.title_preview = create_title_row(
+            width=self.grid_preview.size[0],
+            title=self.params["title"],
+            title_height=max(1, self._scaled(self.params["title_height"])),
+            title_font_size=max(1, self._scaled(self.params["title_font_size"])),
+            title_font_family=self.params["title_font_family"],
+            title_text_color=self.params["title_text_color"],
+            title_bg_color=self.params["title_bg_color"]
+        )
+
+    def _draw_footer(self):
+        self.footer_preview = create_footer_row(
+            width=self.grid_preview.size[0],
+            footer_text=self.params["footer_text"],
+            footer_height=max(1, self._scaled(self.params["footer_height"])),
+            footer_font_size=max(1, self._scaled(self.params["footer_font_size"])),
+            footer_font_family=self.params["footer_font_family"],
+            footer_text_color=self.params["footer_text_color"],
+            footer_bg_color=self.params["footer_bg_color"],
+            footer_left_margin=self._scaled(self.params["footer_left_margin"])
+        )
+
+    def _assemble_preview(self) -> Image.Image:
+        """Stack the title, grid and footer layers and add the margins."""
+        layers = [self.grid_preview]
+        if self.params["title"]:
+            layers.insert(0, self.title_preview)
+        if self.params["footer_text"]:
+            layers.append(self.footer_preview)
+
+        left_margin, right_margin = self.params["left_margin"], self.params["right_margin"]
+        if not (left_margin > 0 or right_margin > 0):
+            left_margin, right_margin = 0, 0
+        left_margin, right_margin = self._scaled(left_margin), self._scaled(right_margin)
+
+        preview = Image.new(
+            "RGBA",
+            (self.grid_preview.size[0] + left_margin + right_margin, sum(layer.size[1] for layer in layers)),
+            self.params["background_color"]
+        )
+        y = 0
+        for layer in layers:
+            preview.paste(layer, (left_margin, y), layer)
+            y += layer.size[1]
+        return preview
+
+
 def main():
     """Example usage of the poster assembly tool."""
     print("Passport Poster Assembly Tool")
@@ -572,7 +1500,7 @@ def main():
         # Save the poster
         output_path = "./produtti/asia_poster_with_labels.jpg"
         os.makedirs("./produtti", exist_ok=True)
-        asia_poster.convert("RGB").save(output_path, "JPEG", quality=95)
+        asia_poster.convert("RGB").save(output_path, "JPEG", quality=DEFAULT_EXPORT_QUALITY)
         print(f"Saved: {output_path}")
 
     # Example 2: Create South America poster (5×3 grid)
@@ -589,7 +1517,7 @@ def main():
         )
 
         output_path = "./produtti/south_america_poster_with_labels.jpg"
-        sa_poster.convert("RGB").save(output_path, "JPEG", quality=95)
+        sa_poster.convert("RGB").save(output_path, "JPEG", quality=DEFAULT_EXPORT_QUALITY)
         print(f"Saved: {output_path}")
 
     # Example 3: Create World poster (23×10 grid for standard print sizes) with title
@@ -624,7 +1552,7 @@ def main():
     )
 
     output_path = "./produtti/world_poster_with_labels.jpg"
-    world_poster.convert("RGB").save(output_path, "JPEG", quality=95)
+    world_poster.convert("RGB").save(output_path, "JPEG", quality=DEFAULT_EXPORT_QUALITY)
     print(f"Saved: {output_path}")
 
     print("\n" + "=" * 50)